@@ -1,48 +1,60 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 # Import the new multimodal client function and the new prompt
 from app.ai.gemini_client import analyze_with_gemini, analyze_with_gemini_multimodal
-from app.ai.prompts import CV_REVIEWER_PROMPT, INTERVIEW_QUESTION_PROMPT, RESUME_PARSER_PROMPT, DESIGN_REVIEWER_PROMPT
+from app.ai.prompts import (
+    CV_REVIEWER_PROMPT,
+    INTERVIEW_QUESTION_PROMPT,
+    RESUME_PARSER_PROMPT,
+    RESUME_PARTIAL_PARSER_PROMPT,
+    DESIGN_REVIEWER_PROMPT,
+)
 
 
 class ResumeParser:
     """Use AI (Gemini) to convert extracted CV text to structured JSON resume fields."""
 
-    def analyze(self, text: str) -> Dict:
-        # Use the prompt template string directly
-        return analyze_with_gemini(RESUME_PARSER_PROMPT, text, task_type="parse_resume")
+    def analyze(self, text: str, timeout: Optional[float] = None, fields: Optional[List[str]] = None) -> Dict:
+        # Use the prompt template string directly; `fields` restricts the model to the fields still missing
+        if fields:
+            return analyze_with_gemini(
+                RESUME_PARTIAL_PARSER_PROMPT, text, task_type="parse_resume", timeout=timeout,
+                extra_inputs={"fields": ", ".join(fields)},
+            )
+        return analyze_with_gemini(RESUME_PARSER_PROMPT, text, task_type="parse_resume", timeout=timeout)
 
 
 class CVReviewer:
     """Produce a review summary (score, strengths, weaknesses, suggestions) from text."""
 
-    def analyze(self, text: str) -> Dict:
-        return analyze_with_gemini(CV_REVIEWER_PROMPT, text, task_type="review")
+    def analyze(self, text: str, timeout: Optional[float] = None) -> Dict:
+        return analyze_with_gemini(CV_REVIEWER_PROMPT, text, task_type="review", timeout=timeout)
 
 
 class InterviewQuestionGenerator:
     """Generate interview topics and questions based on the CV text."""
 
-    def analyze(self, text: str) -> Dict:
-        return analyze_with_gemini(INTERVIEW_QUESTION_PROMPT, text, task_type="interview")
+    def analyze(self, text: str, timeout: Optional[float] = None) -> Dict:
+        return analyze_with_gemini(INTERVIEW_QUESTION_PROMPT, text, task_type="interview", timeout=timeout)
 
 
 # --- New Class for Design Review ---
 class CVDesignReviewer:
     """Analyzes the visual design of a CV from an image."""
 
-    def analyze(self, base64_image: str) -> Dict:
+    def analyze(self, base64_image: str, timeout: Optional[float] = None) -> Dict:
         """
         Analyzes the CV's design using a multimodal AI call.
 
         Args:
             base64_image: A base64 encoded string of the CV's image.
+            timeout: Optional limit in seconds for the Gemini request.
 
         Returns:
             A dictionary containing the structured design review.
         """
         # This calls a new, specialized function in the gemini_client that handles images.
-        return analyze_with_gemini_multimodal(DESIGN_REVIEWER_PROMPT, base64_image, task_type="design_review")
+        return analyze_with_gemini_multimodal(DESIGN_REVIEWER_PROMPT, base64_image, task_type="design_review", timeout=timeout)
 
 
 # --- Updated Orchestration Function ---
@@ -21,6 +21,25 @@ except ImportError:
 load_dotenv()
 
 
+def _create_llm(model_name: str, api_key: str, timeout: Optional[float]) -> "ChatGoogleGenerativeAI":
+    """
+    Builds the Gemini chat model. If GEMINI_API_ENDPOINT is set (e.g. "http://127.0.0.1:8765"),
+    requests go over REST to that endpoint instead, such as the local stand-in used for load tests.
+    """
+    endpoint_kwargs: Dict[str, Any] = {}
+    endpoint = os.getenv("GEMINI_API_ENDPOINT")
+    if endpoint:
+        endpoint_kwargs = {"client_options": {"api_endpoint": endpoint}, "transport": "rest"}
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        google_api_key=api_key,
+        temperature=0.0,
+        timeout=timeout,
+        model_kwargs={"response_mime_type": "application/json"},
+        **endpoint_kwargs,
+    )
+
+
 def _safe_json_parse(s: str) -> Optional[Dict[str, Any]]:
     """Try to robustly parse JSON from a string. Try direct loads first, then extract first JSON object substring."""
     try:
@@ -37,9 +56,17 @@ def _safe_json_parse(s: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def analyze_with_gemini(prompt_template_str: str, documents: str, task_type: str = "review") -> Dict[str, Any]:
+def analyze_with_gemini(
+    prompt_template_str: str,
+    documents: str,
+    task_type: str = "review",
+    timeout: Optional[float] = None,
+    extra_inputs: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
     """
     Calls the Gemini API using the LangChain framework to analyze TEXT documents.
+    `timeout` (seconds) bounds the API request so a slow call cannot outlive the request deadline.
+    `extra_inputs` fills any prompt variables other than {documents}.
     """
     if not _HAS_LANGCHAIN:
         return {"error": "LangChain libraries not found. Please run 'pip install langchain-google-genai'."}
@@ -51,18 +78,13 @@ def analyze_with_gemini(prompt_template_str: str, documents: str, task_type: str
     model_name = os.getenv("GEMINI_MODEL", "gemini-1.5-flash-latest")
 
     try:
-        llm = ChatGoogleGenerativeAI(
-            model=model_name,
-            google_api_key=api_key,
-            temperature=0.0,
-            model_kwargs={"response_mime_type": "application/json"}
-        )
+        llm = _create_llm(model_name, api_key, timeout)
         prompt_template = PromptTemplate.from_template(template=prompt_template_str)
         output_parser = JsonOutputParser()
         chain = prompt_template | llm | output_parser
 
         print(f"Invoking LangChain with model '{model_name}' for task '{task_type}'...")
-        parsed_response = chain.invoke({"documents": documents})
+        parsed_response = chain.invoke({"documents": documents, **(extra_inputs or {})})
         
         return _validate_parsed(parsed_response, task_type)
 
@@ -71,7 +93,9 @@ def analyze_with_gemini(prompt_template_str: str, documents: str, task_type: str
         return {"error": "An error occurred while communicating with the Gemini API via LangChain."}
 
 
-def analyze_with_gemini_multimodal(prompt_template_str: str, base64_image: str, task_type: str = "design_review") -> Dict[str, Any]:
+def analyze_with_gemini_multimodal(
+    prompt_template_str: str, base64_image: str, task_type: str = "design_review", timeout: Optional[float] = None
+) -> Dict[str, Any]:
     """
     Calls the Gemini API using LangChain with both a text prompt and an image for multimodal analysis.
     """
@@ -86,12 +110,7 @@ def analyze_with_gemini_multimodal(prompt_template_str: str, base64_image: str,
 
     try:
         # Initialize the model, which can handle multimodal inputs
-        llm = ChatGoogleGenerativeAI(
-            model=model_name,
-            google_api_key=api_key,
-            temperature=0.0,
-            model_kwargs={"response_mime_type": "application/json"}
-        )
+        llm = _create_llm(model_name, api_key, timeout)
 
         # Create a message structure that includes both the text prompt and the image data
         message = HumanMessage(
@@ -69,6 +69,12 @@ RESUME_PARSER_PROMPT = (
         '}}\n'
 )
 
+# Used when the rule-based parser already filled some fields: the model only extracts the rest
+RESUME_PARTIAL_PARSER_PROMPT = RESUME_PARSER_PROMPT + (
+        '\nIMPORTANT: Only the following fields still need to be extracted: {fields}. '
+        'Leave every other field as its empty value.\n'
+)
+
 DESIGN_REVIEWER_PROMPT = (
     'CONTEXT: You are an expert UI/UX Designer and Graphic Design consultant with a keen eye for professional document layout. Your goal is to analyze the provided CV image and provide a structured, objective design review.\n\n'
     'INSTRUCTIONS:\n'
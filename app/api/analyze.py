@@ -1,17 +1,29 @@
+import asyncio
 import json
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import os
+import time
+from typing import Any, Awaitable, Dict, Optional, Set
+
+from fastapi import APIRouter, UploadFile, File, Header, HTTPException, Query
 from fastapi.responses import JSONResponse
 
-# Import the initial parsing function
-from app.core.extractor import extract_resume_data
-# Import the other AI components for the chain
+# Import the extraction and parsing functions
+from app.core.extractor import extract_structured_json_from_file, parse_structured_resume
+# Import the AI components for the chain
 from app.ai.chain import CVDesignReviewer, CVReviewer, InterviewQuestionGenerator
 # Import the final, comprehensive response model
 from app.core.pdf_renderer import render_pdf_page_to_base64_image
-from app.models.schemas import AnalyzeResponse
+from app.core.concurrency import Deadline, OverloadedError, admission, run_stage
+from app.models.schemas import AnalyzeResponse, StageStatus
 
 router = APIRouter()
 
+# Latency budget used when the caller does not send one
+DEFAULT_BUDGET_SECONDS = float(os.getenv("ANALYZE_DEFAULT_BUDGET_SECONDS", "120"))
+
+# Response sections a caller can select with `include=`
+SECTIONS = ("parsed_resume", "review", "interviewQuestions", "design_review")
+
 
 def _validate_file_type(file: UploadFile) -> None:
     """Helper function to validate the uploaded file's content type."""
@@ -23,65 +35,231 @@ def _validate_file_type(file: UploadFile) -> None:
         raise HTTPException(status_code=400, detail=f"Unsupported file type: {file.content_type}")
 
 
+def _resolve_deadline(budget_ms: Optional[int], header_budget_ms: Optional[int]) -> Deadline:
+    """Builds the request deadline from the query param, then the header, then the default budget."""
+    budget = budget_ms if budget_ms is not None else header_budget_ms
+    if budget is None:
+        return Deadline(DEFAULT_BUDGET_SECONDS)
+    if budget <= 0:
+        raise HTTPException(status_code=400, detail="The latency budget must be a positive number of milliseconds.")
+    return Deadline(budget / 1000)
+
+
+async def _timed_stage(
+    stages: Dict[str, StageStatus], name: str, awaitable: Awaitable[Any], result_key: Optional[str] = None
+) -> Optional[Any]:
+    """
+    Awaits one pipeline stage and records its status and timing in `stages`.
+
+    Returns the stage result (or `result[result_key]` for AI stages), or None if the stage
+    failed or did not finish before the deadline.
+    """
+    start = time.perf_counter()
+    try:
+        result = await awaitable
+    except asyncio.TimeoutError:
+        stages[name] = StageStatus(
+            status="timeout",
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 1),
+            detail="Stage did not finish within the request deadline.",
+        )
+        return None
+    elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    if result_key is not None:
+        if not result or result_key not in result:
+            error = result.get("error", "Unknown error.") if result else "Unknown error."
+            stages[name] = StageStatus(status="error", elapsed_ms=elapsed_ms, detail=error)
+            return None
+        result = result[result_key]
+    elif not result:
+        stages[name] = StageStatus(status="error", elapsed_ms=elapsed_ms, detail="Stage returned no result.")
+        return None
+
+    stages[name] = StageStatus(status="ok", elapsed_ms=elapsed_ms)
+    return result
+
+
+def _skip(stages: Dict[str, StageStatus], *names: str, detail: str) -> None:
+    for name in names:
+        stages[name] = StageStatus(status="skipped", detail=detail)
+
+
+def _resolve_include(include: Optional[str]) -> Set[str]:
+    """Parses the comma-separated `include` param; all sections are computed when it is omitted."""
+    if not include:
+        return set(SECTIONS)
+    requested = {name.strip() for name in include.split(",") if name.strip()}
+    if not requested:
+        raise HTTPException(
+            status_code=400,
+            detail=f"include must name at least one section. Valid sections: {', '.join(SECTIONS)}",
+        )
+    unknown = requested - set(SECTIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sections in include: {', '.join(sorted(unknown))}. Valid sections: {', '.join(SECTIONS)}",
+        )
+    return requested
+
+
 @router.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_resume(file: UploadFile = File(...)):
+async def analyze_resume(
+    file: UploadFile = File(...),
+    budget_ms: Optional[int] = Query(None, description="Latency budget for the whole request, in milliseconds."),
+    x_latency_budget_ms: Optional[int] = Header(None, description="Same as `budget_ms`; the query param wins."),
+    mode: str = Query(
+        "full",
+        description="'lite' fills parsed_resume with rules only, without an LLM parse. Review, interview "
+                    "and design review still call Gemini unless `include` leaves them out.",
+    ),
+    include: Optional[str] = Query(None, description="Comma-separated sections to compute, e.g. 'parsed_resume,review'."),
+):
     """
     Receives a CV file, orchestrates the full extraction and chained analysis pipeline,
     and returns a comprehensive result including parsed data, a review, and interview questions.
+
+    Only the sections listed in `include` (and the stages they depend on) are computed.
+    Every stage is bounded by the request's latency budget. Stages that miss it are cancelled,
+    and the response carries whatever completed along with per-stage status and timing.
     """
     _validate_file_type(file)
+    if mode not in ("full", "lite"):
+        raise HTTPException(status_code=400, detail=f"Unsupported mode: {mode}")
+    sections = _resolve_include(include)
+    if sections == {"design_review"} and not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="Design review is only available for PDF files.")
+    deadline = _resolve_deadline(budget_ms, x_latency_budget_ms)
+
+    # --- Admission control: shed load instead of piling up jobs ---
+    try:
+        async with admission.admit(max_wait=min(admission.max_wait, deadline.remaining())):
+            return await _run_analysis(file, deadline, mode, sections)
+    except OverloadedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Service overloaded: {e.reason}",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+async def _run_analysis(file: UploadFile, deadline: Deadline, mode: str, sections: Set[str]) -> JSONResponse:
+    """
+    Runs the analysis pipeline for an admitted request. The design review branch
+    (render -> design review) runs alongside the text branch (extract -> parse ->
+    review + interview questions), with each stage under its concurrency limit.
+    Branches and stages not needed for the requested `sections` are skipped.
+    """
     content = await file.read()
+    stages: Dict[str, StageStatus] = {}
+
+    async def not_requested(*names: str) -> None:
+        _skip(stages, *names, detail="Not requested.")
+
+    async def design_branch() -> Optional[Dict]:
+        if "design_review" not in sections:
+            # No design review requested: the PDF is never rendered
+            return await not_requested("render", "design_review")
+        if not file.filename.lower().endswith(".pdf"):
+            _skip(stages, "render", "design_review", detail="Design review is only available for PDF files.")
+            return None
 
-    # --- Pre-process file for both text and image analysis ---
-    base64_image = None
-    if file.filename.lower().endswith(".pdf"):
         print("Rendering PDF to image for design analysis...")
-        base64_image = render_pdf_page_to_base64_image(content)
-
-    # --- Step 1: Parse the CV ---
-    # This calls the two-step process: unstructured -> Gemini parser
-    print("Step 1: Parsing resume...")
-    parser_result = extract_resume_data(content=content, filename=file.filename)
-
-    # Validate the crucial first step
-    if not parser_result or "parsed_resume" not in parser_result:
-        error_detail = parser_result.get("error", "An unknown error occurred during parsing.")
-        raise HTTPException(status_code=500, detail=error_detail)
-    
-    parsed_resume = parser_result["parsed_resume"]
-    print("Step 1: Success.")
-
-    # Convert the parsed resume dict back into a clean JSON string for the next AI steps
-    structured_resume_json = json.dumps(parsed_resume, indent=2, ensure_ascii=False)
-
-    # --- Step 2: Review the Parsed Data ---
-    print("Step 2: Reviewing parsed data...")
-    design_review = {}
-    if base64_image:
-        print("Step 4: Analyzing CV design from image...")
-        design_reviewer = CVDesignReviewer()
-        design_review_result = design_reviewer.analyze(base64_image)
-        design_review = design_review_result.get("design_review", {})
-        
-    reviewer = CVReviewer()
-    review_result = reviewer.analyze(structured_resume_json)
-    review = review_result.get("review", {})
-    print("Step 2: Success.")
-
-    # --- Step 3: Generate Interview Questions from Parsed Data ---
-    print("Step 3: Generating interview questions...")
-    generator = InterviewQuestionGenerator()
-    interview_result = generator.analyze(structured_resume_json)
-    interview_questions = interview_result.get("interviewQuestions", [])
-    print("Step 3: Success.")
+        base64_image = await _timed_stage(
+            stages, "render", run_stage("render", render_pdf_page_to_base64_image, content, deadline=deadline)
+        )
+        if base64_image is None:
+            _skip(stages, "design_review", detail="PDF rendering did not complete.")
+            return None
 
-    # --- Step 4: Combine and Return ---
-    final_result = {
+        print("Analyzing CV design from image...")
+        return await _timed_stage(
+            stages,
+            "design_review",
+            run_stage("llm", CVDesignReviewer().analyze, base64_image, deadline=deadline, pass_timeout=True),
+            result_key="design_review",
+        )
+
+    async def text_branch():
+        if not sections & {"parsed_resume", "review", "interviewQuestions"}:
+            await not_requested("extract", "parse", "review", "interview")
+            return None, None, None
+
+        # --- Step 1: Parse the CV ---
+        # This is the two-step process: unstructured -> rules + Gemini parser, each under its own stage limit
+        print("Step 1: Parsing resume...")
+        structured_json_str = await _timed_stage(
+            stages, "extract", run_stage("extract", extract_structured_json_from_file, file.filename, content, deadline=deadline)
+        )
+        if structured_json_str is None:
+            _skip(stages, "parse", "review", "interview", detail="Text extraction did not complete.")
+            return None, None, None
+
+        if mode == "lite":
+            # Rules only: milliseconds of CPU, so no threadpool hop or LLM slot is needed
+            async def parse_lite() -> Dict:
+                return parse_structured_resume(structured_json_str, mode="lite")
+            parse = parse_lite()
+        else:
+            parse = run_stage(
+                "llm", parse_structured_resume, structured_json_str,
+                mode=mode, deadline=deadline, pass_timeout=True,
+            )
+        parsed_resume = await _timed_stage(stages, "parse", parse, result_key="parsed_resume")
+        if parsed_resume is None:
+            _skip(stages, "review", "interview", detail="Resume parsing did not complete.")
+            return None, None, None
+        print("Step 1: Success.")
+
+        # Convert the parsed resume dict back into a clean JSON string for the next AI steps
+        structured_resume_json = json.dumps(parsed_resume, indent=2, ensure_ascii=False)
+
+        # --- Steps 2 and 3: Review the parsed data and generate interview questions ---
+        print("Steps 2-3: Reviewing parsed data and generating interview questions...")
+        review, interview_questions = await asyncio.gather(
+            _timed_stage(
+                stages,
+                "review",
+                run_stage("llm", CVReviewer().analyze, structured_resume_json, deadline=deadline, pass_timeout=True),
+                result_key="review",
+            ) if "review" in sections else not_requested("review"),
+            _timed_stage(
+                stages,
+                "interview",
+                run_stage(
+                    "llm", InterviewQuestionGenerator().analyze, structured_resume_json,
+                    deadline=deadline, pass_timeout=True,
+                ),
+                result_key="interviewQuestions",
+            ) if "interviewQuestions" in sections else not_requested("interview"),
+        )
+        return parsed_resume, review, interview_questions
+
+    design_review, (parsed_resume, review, interview_questions) = await asyncio.gather(design_branch(), text_branch())
+    results = {
         "parsed_resume": parsed_resume,
-        "design_review": design_review,
         "review": review,
-        "interviewQuestions": interview_questions
+        "interviewQuestions": interview_questions,
+        "design_review": design_review,
     }
-    
-    return JSONResponse(content=final_result)
+    # Sections computed only as a dependency (e.g. parsed_resume for review) are not returned
+    results = {name: value if name in sections else None for name, value in results.items()}
+
+    # Nothing usable completed: surface the failure instead of an empty 200
+    if all(results[name] is None for name in sections):
+        timed_out = any(stage.status == "timeout" for stage in stages.values())
+        failed = next((stage.detail for stage in stages.values() if stage.status in ("error", "timeout")), "")
+        raise HTTPException(
+            status_code=504 if timed_out else 500,
+            detail=failed or "An unknown error occurred during parsing.",
+        )
+
+    # --- Step 4: Combine and Return ---
+    final_result = AnalyzeResponse(
+        **results,
+        stages=stages,
+        partial=any(stage.status in ("error", "timeout") for stage in stages.values()),
+    )
 
+    return JSONResponse(content=final_result.dict())
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+
+from app.core.concurrency import concurrency_stats
+from app.core.loop_lag import loop_lag_monitor
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Returns admission-queue depth, rejection counters, per-stage concurrency usage
+    and event-loop lag.
+    """
+    return {**concurrency_stats(), "event_loop": loop_lag_monitor.stats()}
@@ -0,0 +1,210 @@
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+
+# --- Per-stage concurrency limits ---
+# Each blocking stage runs in the threadpool, guarded by its own semaphore so a burst of
+# uploads cannot start more partition() jobs, PDF renders or Gemini calls than configured.
+_STAGE_LIMITS: Dict[str, int] = {
+    "extract": int(os.getenv("EXTRACT_CONCURRENCY", str(os.cpu_count() or 1))),
+    "render": int(os.getenv("RENDER_CONCURRENCY", str(os.cpu_count() or 1))),
+    "llm": int(os.getenv("LLM_CONCURRENCY", "8")),
+}
+_stage_semaphores: Dict[str, asyncio.Semaphore] = {
+    stage: asyncio.Semaphore(limit) for stage, limit in _STAGE_LIMITS.items()
+}
+_stage_in_use: Dict[str, int] = {stage: 0 for stage in _STAGE_LIMITS}
+
+
+class Deadline:
+    """A request-level latency budget, measured on the monotonic clock."""
+
+    def __init__(self, budget_seconds: float):
+        self.budget = budget_seconds
+        self._expires_at = time.monotonic() + budget_seconds
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+
+async def run_stage(
+    stage: str,
+    func: Callable[..., Any],
+    *args: Any,
+    deadline: Optional[Deadline] = None,
+    pass_timeout: bool = False,
+    **kwargs: Any,
+) -> Any:
+    """
+    Runs a blocking pipeline function in the threadpool under the stage's concurrency limit.
+
+    If `deadline` passes first, asyncio.TimeoutError is raised. A stage still waiting for its
+    semaphore is cancelled outright, and one that gets its slot after the deadline is not run.
+    A running thread cannot be interrupted, so with `pass_timeout` the function receives
+    `timeout=` the budget left once the slot is acquired (e.g. for the Gemini request), which
+    bounds how long an abandoned call keeps its slot.
+    """
+    started = False
+
+    async def _run() -> Any:
+        nonlocal started
+        async with _stage_semaphores[stage]:
+            if deadline is not None:
+                if deadline.expired:
+                    raise asyncio.TimeoutError()
+                if pass_timeout:
+                    kwargs["timeout"] = deadline.remaining()
+            started = True
+            _stage_in_use[stage] += 1
+            try:
+                return await run_in_threadpool(func, *args, **kwargs)
+            finally:
+                _stage_in_use[stage] -= 1
+
+    if deadline is None:
+        return await _run()
+
+    task = asyncio.ensure_future(_run())
+    # Retrieve the outcome of abandoned stages so late failures are not reported as unhandled
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    try:
+        # shield() keeps the slot accounting intact when a running thread outlives the deadline
+        return await asyncio.wait_for(asyncio.shield(task), timeout=deadline.remaining())
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        if not started:
+            task.cancel()
+        raise
+
+
+class OverloadedError(Exception):
+    """Raised when a request is rejected by admission control."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    A bounded admission queue in front of the analysis pipeline.
+
+    At most `max_in_flight` analyses run at once and at most `max_queue` wait for a slot.
+    Requests are shed instead of queued when the queue is full or when the estimated
+    wait (based on a moving average of recent service times) exceeds `max_wait`.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, max_wait: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._avg_service_time: Optional[float] = None
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.admitted = 0
+        self.completed = 0
+        self.rejected_queue_full = 0
+        self.rejected_wait = 0
+
+    def estimated_wait(self) -> float:
+        """Estimated seconds a new request would wait for a free slot."""
+        if self.in_flight < self.max_in_flight or self._avg_service_time is None:
+            return 0.0
+        # Every max_in_flight completions free one "round" of slots for the queue
+        return (self.queue_depth // self.max_in_flight + 1) * self._avg_service_time
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self.estimated_wait() or (self._avg_service_time or 1.0)))
+
+    def _record_service_time(self, elapsed: float) -> None:
+        # Exponentially weighted moving average of the time an admitted request holds a slot
+        if self._avg_service_time is None:
+            self._avg_service_time = elapsed
+        else:
+            self._avg_service_time = 0.8 * self._avg_service_time + 0.2 * elapsed
+
+    @asynccontextmanager
+    async def admit(self, max_wait: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Waits for a pipeline slot, or raises OverloadedError if the request should be shed.
+
+        Args:
+            max_wait: Upper bound in seconds on the time spent queueing; defaults to `self.max_wait`.
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        if not self._slots.locked():
+            # Fast path: a slot is free, so take it without ever entering the queue.
+            # acquire() does not suspend here, so no other arrival can slip in between.
+            await self._slots.acquire()
+        else:
+            if self.queue_depth >= self.max_queue:
+                self.rejected_queue_full += 1
+                raise OverloadedError("Admission queue is full.", self._retry_after())
+            if self.estimated_wait() > max_wait:
+                self.rejected_wait += 1
+                raise OverloadedError("Estimated queueing time exceeds the deadline.", self._retry_after())
+
+            self.queue_depth += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=max_wait)
+            except asyncio.TimeoutError:
+                self.rejected_wait += 1
+                raise OverloadedError("Timed out waiting in the admission queue.", self._retry_after())
+            finally:
+                self.queue_depth -= 1
+
+        self.in_flight += 1
+        self.admitted += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record_service_time(time.perf_counter() - start)
+            self.in_flight -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the queue and rejection counters."""
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "admitted": self.admitted,
+            "completed": self.completed,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_wait": self.rejected_wait,
+            "estimated_wait_seconds": round(self.estimated_wait(), 3),
+            "avg_service_time_seconds": round(self._avg_service_time or 0.0, 3),
+        }
+
+
+admission = AdmissionController(
+    max_in_flight=int(os.getenv("ANALYZE_MAX_CONCURRENCY", "4")),
+    max_queue=int(os.getenv("ANALYZE_MAX_QUEUE", "16")),
+    max_wait=float(os.getenv("ANALYZE_MAX_QUEUE_WAIT_SECONDS", "30")),
+)
+
+
+def concurrency_stats() -> Dict[str, Any]:
+    """Admission counters plus the configured per-stage limits."""
+    return {
+        "admission": admission.stats(),
+        "stages": {
+            stage: {"limit": limit, "in_use": _stage_in_use[stage]}
+            for stage, limit in _STAGE_LIMITS.items()
+        },
+    }
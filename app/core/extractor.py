@@ -1,9 +1,15 @@
 import json
+import math
+import multiprocessing
 import os
 import tempfile
-from typing import Optional, Dict, List, Any
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Dict, List, Any, Tuple
 
 from app.ai.chain import ResumeParser
+from app.core.lite_parser import llm_fields, parse_elements
 
 try:
     # Use the generic auto partition which detects file type
@@ -12,6 +18,133 @@ try:
 except ImportError:
     _HAS_UNSTRUCTURED = False
 
+try:
+    # pypdf ships with unstructured[pdf]; it is only used to split long PDFs into page ranges
+    from pypdf import PdfReader, PdfWriter
+    _HAS_PYPDF = True
+except ImportError:
+    _HAS_PYPDF = False
+
+# --- Page-parallel partitioning settings ---
+# PDFs with fewer pages than this are partitioned serially in the request process.
+PARALLEL_MIN_PAGES = int(os.getenv("PARTITION_PARALLEL_MIN_PAGES", "4"))
+# Number of worker processes; defaults to the number of CPU cores.
+PARALLEL_MAX_WORKERS = int(os.getenv("PARTITION_MAX_WORKERS", "0")) or (os.cpu_count() or 1)
+# Pages per chunk; 0 means "spread the pages evenly across the workers".
+PAGES_PER_CHUNK = int(os.getenv("PARTITION_PAGES_PER_CHUNK", "0"))
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+# Extraction runs in threadpool threads, so pool creation and reset must not race
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Lazily create the shared process pool used for page-parallel partitioning."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # 'spawn' avoids forking a server process that already runs threads and loaded models
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PARALLEL_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def _reset_process_pool(failed_pool: Optional[ProcessPoolExecutor] = None) -> None:
+    """
+    Drop a broken pool so the next long document gets a fresh one. If `failed_pool` is given,
+    the shared pool is only dropped if it is still that pool, so a pool another thread has
+    already replaced is left alone.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None or (failed_pool is not None and _process_pool is not failed_pool):
+            return
+        pool, _process_pool = _process_pool, None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _partition_to_dicts(path: str, **kwargs: Any) -> List[Dict[str, Any]]:
+    """Partition a file and convert the elements into plain (picklable) dicts."""
+    elements = partition(filename=path, **kwargs)
+    return [{"type": el.__class__.__name__, "text": str(el)} for el in elements]
+
+
+def _count_pdf_pages(path: str) -> int:
+    """Return the number of pages in a PDF, or 0 if it cannot be read."""
+    try:
+        return len(PdfReader(path).pages)
+    except Exception as e:
+        print(f"Could not count PDF pages, falling back to serial partitioning: {e}")
+        return 0
+
+
+def _split_pdf(path: str, page_count: int, chunk_size: int, out_dir: str) -> List[Tuple[int, str]]:
+    """
+    Splits a PDF into consecutive page ranges written to `out_dir`.
+
+    Returns:
+        A list of (first_page_number, chunk_path) tuples in page order (1-based page numbers).
+    """
+    reader = PdfReader(path)
+    chunks = []
+    for start in range(0, page_count, chunk_size):
+        writer = PdfWriter()
+        for page_index in range(start, min(start + chunk_size, page_count)):
+            writer.add_page(reader.pages[page_index])
+        chunk_path = os.path.join(out_dir, f"pages-{start + 1:05d}.pdf")
+        with open(chunk_path, "wb") as f:
+            writer.write(f)
+        chunks.append((start + 1, chunk_path))
+    return chunks
+
+
+def _partition_pdf_parallel(path: str, page_count: int, pool: ProcessPoolExecutor) -> List[Dict[str, Any]]:
+    """
+    Partitions a long PDF by page range across the process pool and merges
+    the element lists back in page order.
+    """
+    chunk_size = PAGES_PER_CHUNK or math.ceil(page_count / PARALLEL_MAX_WORKERS)
+    with tempfile.TemporaryDirectory() as out_dir:
+        chunks = _split_pdf(path, page_count, max(1, chunk_size), out_dir)
+        print(f"Partitioning {page_count} pages in {len(chunks)} chunks across {PARALLEL_MAX_WORKERS} processes...")
+        futures = []
+        try:
+            for first_page, chunk_path in chunks:
+                futures.append(pool.submit(_partition_to_dicts, chunk_path, starting_page_number=first_page))
+            # Collect in submission order, which is page order
+            structured_data: List[Dict[str, Any]] = []
+            for future in futures:
+                structured_data.extend(future.result())
+            return structured_data
+        except BaseException:
+            # Don't leave queued chunks running for a document that is being given up on
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def _partition_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Partitions a file, using the process pool for PDFs at or above the page threshold.
+    Any failure on the parallel path (splitting, the pool, or a single chunk) falls back
+    to partitioning the whole file serially.
+    """
+    if path.lower().endswith(".pdf") and _HAS_PYPDF and PARALLEL_MAX_WORKERS > 1:
+        page_count = _count_pdf_pages(path)
+        if page_count >= max(2, PARALLEL_MIN_PAGES):
+            pool = _get_process_pool()
+            try:
+                return _partition_pdf_parallel(path, page_count, pool)
+            except BrokenProcessPool as e:
+                print(f"Process pool failed, partitioning serially instead: {e}")
+                _reset_process_pool(pool)
+            except Exception as e:
+                # e.g. pypdf could not split the file, a chunk failed, or another thread reset the pool
+                print(f"Parallel partitioning failed, partitioning serially instead: {e}")
+    return _partition_to_dicts(path)
+
 
 def extract_structured_json_from_file(filename: str, content: bytes) -> Optional[str]:
     """
@@ -19,6 +152,8 @@ def extract_structured_json_from_file(filename: str, content: bytes) -> Optional
     and returns it as a JSON formatted string.
 
     This is the crucial first step that preserves the document's layout and context.
+    Long PDFs (see PARTITION_PARALLEL_MIN_PAGES) are split into page ranges that are
+    partitioned in parallel worker processes.
     """
     if not _HAS_UNSTRUCTURED:
         print("Warning: 'unstructured' library not found. Parsing will be unreliable.")
@@ -36,10 +171,7 @@ def extract_structured_json_from_file(filename: str, content: bytes) -> Optional
             tmp.write(content)
             path = tmp.name
 
-        elements = partition(filename=path)
-        structured_data: List[Dict[str, Any]] = [
-            {"type": el.__class__.__name__, "text": str(el)} for el in elements
-        ]
+        structured_data = _partition_file(path)
         return json.dumps(structured_data, indent=2, ensure_ascii=False)
     except Exception as e:
         print(f"Error partitioning file with unstructured: {e}")
@@ -49,7 +181,34 @@ def extract_structured_json_from_file(filename: str, content: bytes) -> Optional
             os.unlink(path)
 
 
-def extract_resume_data(content: bytes, filename: str) -> Dict:
+def parse_structured_resume(structured_json_str: str, mode: str = "full", timeout: Optional[float] = None) -> Dict:
+    """
+    Converts the extracted elements into the final ParsedResume fields.
+
+    Rule-based extraction (contact info, sections, skills) runs first. In "lite" mode its
+    result is returned as is, with no LLM call; this is the only mode that saves latency.
+    In "full" mode Gemini is always called with the whole document: only the high-precision
+    rule values (email, phone) are kept, and the model is asked for every other field.
+    """
+    rule_result = parse_elements(json.loads(structured_json_str))
+    if mode == "lite":
+        return rule_result
+
+    rule_resume = rule_result["parsed_resume"]
+    fields = llm_fields(rule_resume)
+    parser = ResumeParser()
+    llm_result = parser.analyze(structured_json_str, timeout=timeout, fields=fields)
+    if "parsed_resume" not in llm_result:
+        # Surface the failure so the parse stage is reported as an error, not as rule-only data
+        return llm_result
+
+    merged = dict(rule_resume)
+    for field in fields:
+        merged[field] = llm_result["parsed_resume"][field]
+    return {"parsed_resume": merged}
+
+
+def extract_resume_data(content: bytes, filename: str, mode: str = "full") -> Dict:
     """
     Orchestrates the new, more reliable resume data extraction process.
     """
@@ -59,9 +218,8 @@ def extract_resume_data(content: bytes, filename: str) -> Dict:
     if not structured_json_str:
         return {"error": "Failed to extract structured data using unstructured."}
 
-    # Step 2: Use the AI-powered parser to convert the structured JSON into the final, semantic JSON.
-    parser = ResumeParser()
-    parsed_data = parser.analyze(structured_json_str)
+    # Step 2: Fill the semantic fields with rules, then with the AI-powered parser for whatever is left.
+    parsed_data = parse_structured_resume(structured_json_str, mode=mode)
     print(f"Extracted data: {parsed_data}")
 
-    return parsed_data
\ No newline at end of file
+    return parsed_data
@@ -0,0 +1,324 @@
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.models.schemas import AwardItem, CertificationItem, ParsedResume
+
+
+# --- Dictionaries ---
+# Section headings (English and Vietnamese) mapped to the ParsedResume field they introduce.
+# Sections without a matching field (e.g. "interests") still end the previous section.
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    "summary": [
+        "summary", "professional summary", "profile", "professional profile", "about me", "about",
+        "objective", "career objective", "career goal", "career goals",
+        "mục tiêu", "mục tiêu nghề nghiệp", "giới thiệu", "giới thiệu bản thân", "tóm tắt", "tổng quan",
+    ],
+    "work_experience": [
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "career history", "kinh nghiệm", "kinh nghiệm làm việc", "quá trình làm việc",
+    ],
+    "projects": [
+        "projects", "personal projects", "academic projects", "side projects", "project experience",
+        "dự án", "dự án cá nhân", "dự án tham gia",
+    ],
+    "education": [
+        "education", "academic background", "education and training", "học vấn", "trình độ học vấn", "quá trình học tập",
+    ],
+    "skills": [
+        "skills", "technical skills", "core skills", "key skills", "skills and tools", "competencies",
+        "technologies", "tech stack", "kỹ năng", "kĩ năng", "kỹ năng chuyên môn", "kỹ năng mềm",
+    ],
+    "certifications": [
+        "certifications", "certification", "certificates", "licenses and certifications",
+        "chứng chỉ", "chứng nhận", "bằng cấp và chứng chỉ",
+    ],
+    "awards": [
+        "awards", "honors", "honours", "honors and awards", "achievements", "awards and achievements",
+        "giải thưởng", "thành tích", "danh hiệu",
+    ],
+    "languages": ["languages", "language", "ngoại ngữ", "ngôn ngữ"],
+    "contact": [
+        "contact", "contact information", "personal information", "personal details",
+        "thông tin liên hệ", "liên hệ", "thông tin cá nhân",
+    ],
+    "other": [
+        "interests", "hobbies", "references", "activities", "volunteer", "volunteering", "publications",
+        "sở thích", "hoạt động", "người tham chiếu",
+    ],
+}
+
+# Canonical skill names; matching is case-insensitive on word boundaries.
+SKILLS: List[str] = [
+    # Languages
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Golang", "Rust", "Kotlin", "Swift",
+    "Objective-C", "PHP", "Ruby", "Scala", "Dart", "Perl", "MATLAB", "Bash", "Shell", "PowerShell", "SQL",
+    "PL/SQL", "T-SQL", "HTML", "HTML5", "CSS", "CSS3", "Sass", "Solidity", "Lua", "Haskell", "Elixir",
+    # Frameworks and libraries
+    "Spring", "Spring Boot", "Spring MVC", "Hibernate", "JPA", "Django", "Flask", "FastAPI", "Node.js",
+    "Express", "Express.js", "NestJS", "React", "React Native", "Redux", "Next.js", "Vue", "Vue.js", "Nuxt.js",
+    "Angular", "Svelte", "jQuery", "Bootstrap", "Tailwind CSS", "Material UI", "Ant Design", ".NET", "ASP.NET",
+    ".NET Core", "Laravel", "Ruby on Rails", "Flutter", "Android", "iOS", "SwiftUI", "Unity", "GraphQL",
+    "REST", "RESTful API", "gRPC", "WebSocket", "Microservices", "LangChain",
+    # Data and ML
+    "Pandas", "NumPy", "SciPy", "scikit-learn", "TensorFlow", "PyTorch", "Keras", "OpenCV", "Hugging Face",
+    "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Data Analysis", "Data Visualization",
+    "Power BI", "Tableau", "Excel", "Spark", "Apache Spark", "Hadoop", "Kafka", "Airflow", "dbt", "ETL",
+    # Databases
+    "MySQL", "PostgreSQL", "SQL Server", "Oracle", "SQLite", "MongoDB", "Redis", "Cassandra", "DynamoDB",
+    "Elasticsearch", "Firebase", "MariaDB", "Neo4j",
+    # Cloud and DevOps
+    "AWS", "Azure", "GCP", "Google Cloud", "Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins",
+    "GitHub Actions", "GitLab CI", "CI/CD", "Linux", "Nginx", "Apache", "RabbitMQ", "Prometheus", "Grafana",
+    # Tools and practices
+    "Git", "GitHub", "GitLab", "Jira", "Confluence", "Postman", "Swagger", "Figma", "Adobe Photoshop",
+    "Adobe Illustrator", "Maven", "Gradle", "JUnit", "Selenium", "Cypress", "Jest", "Agile", "Scrum",
+    "Kanban", "OOP", "Design Patterns", "System Design", "Unit Testing", "TDD", "Microsoft Office",
+    # Soft skills
+    "Communication", "Teamwork", "Leadership", "Problem Solving", "Time Management", "Critical Thinking",
+    "Presentation", "Negotiation", "Project Management",
+    "Giao tiếp", "Làm việc nhóm", "Lãnh đạo", "Giải quyết vấn đề", "Quản lý thời gian", "Tư duy phản biện",
+    "Thuyết trình",
+]
+
+LANGUAGES: List[str] = [
+    "English", "Vietnamese", "Japanese", "Chinese", "Mandarin", "Cantonese", "Korean", "French", "German",
+    "Spanish", "Portuguese", "Italian", "Russian", "Thai", "Arabic", "Hindi", "Dutch",
+    "Tiếng Anh", "Tiếng Việt", "Tiếng Nhật", "Tiếng Trung", "Tiếng Hàn", "Tiếng Pháp", "Tiếng Đức",
+    "Tiếng Tây Ban Nha", "Tiếng Nga",
+]
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+# Digits with optional +country code and common separators; validated by digit count below
+PHONE_RE = re.compile(r"(?<![\w+])\+?\(?\d[\d\s().-]{7,}\d(?!\w)")
+LOCATION_RE = re.compile(r"(?:address|location|địa chỉ|nơi ở)\s*[:\-]\s*([^\n|•]+)", re.IGNORECASE)
+_LABEL_RE = re.compile(r"^(?:name|full name|họ và tên|họ tên)\s*[:\-]\s*", re.IGNORECASE)
+_BULLET_RE = re.compile(r"^[\s•●▪◦·*\-–—]+")
+# Document titles that sit where the name usually is
+_DOCUMENT_TITLES = {"curriculum vitae", "resume", "résumé", "cv", "sơ yếu lý lịch", "hồ sơ xin việc"}
+# Words that mark a headline/job title rather than a person's name
+_ROLE_WORDS_RE = re.compile(
+    r"\b(?:engineer|developer|intern|manager|designer|analyst|architect|consultant|specialist|"
+    r"student|lead|officer|administrator|tester|scientist|programmer|"
+    r"kỹ sư|lập trình viên|thực tập sinh|chuyên viên|nhân viên|sinh viên|trưởng nhóm)\b",
+    re.IGNORECASE,
+)
+
+# Fields the rules can extract; work_experience, projects and education always need the LLM
+RULE_FIELDS = ("name", "email", "phone", "summary", "skills", "certifications", "awards", "languages", "location")
+# Rule values precise enough to be kept over the LLM's in full mode; the other rule fields are heuristics
+HIGH_PRECISION_FIELDS = ("email", "phone")
+
+
+class AhoCorasickMatcher:
+    """
+    Case-insensitive multi-pattern matcher (Aho-Corasick automaton) over whole words.
+
+    Finds every dictionary term in a single pass over the text, regardless of the
+    dictionary size, and returns the canonical form of each term.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # For each state: (pattern length, canonical term) of every pattern ending there
+        self._out: List[List[Tuple[int, str]]] = [[]]
+        for term in terms:
+            self._add(term.lower(), term)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, term: str) -> None:
+        state = 0
+        for ch in pattern:
+            if ch not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][ch] = len(self._goto) - 1
+            state = self._goto[state][ch]
+        self._out[state].append((len(pattern), term))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    @staticmethod
+    def _is_boundary(text: str, index: int) -> bool:
+        return index < 0 or index >= len(text) or not (text[index].isalnum() or text[index] in "+#")
+
+    def find_all(self, text: str) -> List[str]:
+        """Returns the canonical terms found in `text`, in order of first appearance, without overlaps."""
+        lowered = text.lower()
+        matches: List[Tuple[int, int, str]] = []
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, term in self._out[state]:
+                start = i - length + 1
+                if self._is_boundary(lowered, start - 1) and self._is_boundary(lowered, i + 1):
+                    matches.append((start, i + 1, term))
+
+        # Keep the leftmost-longest match wherever matches overlap (e.g. "Spring Boot" over "Spring")
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        found: List[str] = []
+        last_end = -1
+        for start, end, term in matches:
+            if start >= last_end:
+                last_end = end
+                if term not in found:
+                    found.append(term)
+        return found
+
+
+def _normalize_heading(text: str) -> str:
+    text = re.sub(r"[^\w\s/&]", " ", text.lower())
+    text = text.replace("&", " and ").replace("/", " and ")
+    return " ".join(text.split())
+
+
+_HEADING_LOOKUP: Dict[str, str] = {
+    _normalize_heading(variant): field for field, variants in SECTION_HEADINGS.items() for variant in variants
+}
+_skill_matcher = AhoCorasickMatcher(SKILLS)
+_language_matcher = AhoCorasickMatcher(LANGUAGES)
+
+
+def detect_section(text: str) -> Optional[str]:
+    """Returns the section a heading line introduces, or None if the line is not a heading."""
+    if len(text) > 60:
+        return None
+    return _HEADING_LOOKUP.get(_normalize_heading(text))
+
+
+def _split_sections(elements: List[Dict[str, Any]]) -> Tuple[List[Tuple[str, str]], Dict[str, List[str]]]:
+    """
+    Splits element texts into a header block of (type, text) pairs before any heading,
+    and per-section lines.
+    """
+    header: List[Tuple[str, str]] = []
+    sections: Dict[str, List[str]] = {}
+    current: Optional[str] = None
+    for el in elements:
+        text = (el.get("text") or "").strip()
+        if not text:
+            continue
+        section = detect_section(text)
+        if section:
+            current = section
+            sections.setdefault(section, [])
+        elif current is None:
+            header.append((el.get("type") or "", text))
+        else:
+            sections[current].append(text)
+    return header, sections
+
+
+def _find_phone(text: str) -> str:
+    for match in PHONE_RE.finditer(text):
+        candidate = match.group(0).strip()
+        digits = re.sub(r"\D", "", candidate)
+        if 9 <= len(digits) <= 15:
+            return candidate
+    return ""
+
+
+def _looks_like_name(line: str) -> bool:
+    words = line.split()
+    if not 2 <= len(words) <= 6:
+        return False
+    if any(ch.isdigit() for ch in line) or "@" in line:
+        return False
+    if _normalize_heading(line) in _DOCUMENT_TITLES or detect_section(line) or _ROLE_WORDS_RE.search(line):
+        return False
+    return all(word.replace("-", "").replace(".", "").replace("'", "").isalpha() for word in words)
+
+
+def _find_name(header: List[Tuple[str, str]]) -> str:
+    """
+    Picks the candidate's name from the top of the CV: a short, letters-only line that is not a
+    document title ("Curriculum Vitae"), a heading or a job title. A `Title` element is preferred,
+    then the line right before the contact line, then the first such line.
+    """
+    lines = [
+        (el_type, _LABEL_RE.sub("", line).strip())
+        for el_type, text in header[:8]
+        for line in text.split("\n")
+        if line.strip()
+    ]
+    candidates = [(i, el_type, line) for i, (el_type, line) in enumerate(lines) if _looks_like_name(line)]
+    if not candidates:
+        return ""
+
+    for _, el_type, line in candidates:
+        if el_type == "Title":
+            return line
+    for i, _, line in candidates:
+        following = lines[i + 1][1] if i + 1 < len(lines) else ""
+        if EMAIL_RE.search(following) or _find_phone(following):
+            return line
+    return candidates[0][2]
+
+
+def _item_lines(lines: List[str]) -> List[str]:
+    items = []
+    for line in lines:
+        for part in line.split("\n"):
+            part = _BULLET_RE.sub("", part).strip()
+            if part:
+                items.append(part)
+    return items
+
+
+def parse_elements(elements: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Extracts the deterministic ParsedResume fields from `unstructured` elements using rules only.
+
+    Args:
+        elements: The element dicts ({"type", "text"}) produced by the extractor.
+
+    Returns:
+        A dict with the key "parsed_resume", like the AI parser's output.
+    """
+    header, sections = _split_sections(elements)
+    full_text = "\n".join(el.get("text") or "" for el in elements)
+
+    email_match = EMAIL_RE.search(full_text)
+    location_match = LOCATION_RE.search(full_text)
+
+    resume = ParsedResume(
+        name=_find_name(header),
+        email=email_match.group(0) if email_match else "",
+        phone=_find_phone(full_text),
+        # Contact lines often sit right under a "Profile"/"About" heading; they are not the summary
+        summary=" ".join(
+            line for line in sections.get("summary", []) if not EMAIL_RE.search(line) and not _find_phone(line)
+        ),
+        # Only inside a skills section: across the whole text, prose words like "go" or "express" match
+        skills=_skill_matcher.find_all("\n".join(sections.get("skills", []))),
+        certifications=[CertificationItem(name=item) for item in _item_lines(sections.get("certifications", []))],
+        awards=[AwardItem(name=item) for item in _item_lines(sections.get("awards", []))],
+        languages=_language_matcher.find_all("\n".join(sections.get("languages", []))),
+        location=location_match.group(1).strip() if location_match else "",
+    )
+    return {"parsed_resume": resume.dict()}
+
+
+def llm_fields(parsed_resume: Dict[str, Any]) -> List[str]:
+    """
+    Returns the fields the LLM should still extract in full mode: everything except the
+    high-precision rule fields (email, phone) that the rules managed to fill.
+    """
+    return [
+        field for field in ParsedResume.__fields__
+        if field not in HIGH_PRECISION_FIELDS or not parsed_resume.get(field)
+    ]
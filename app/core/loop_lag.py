@@ -0,0 +1,51 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+
+class EventLoopLagMonitor:
+    """
+    Measures event-loop lag: how late a periodic wake-up fires compared to when it was scheduled.
+
+    Sustained lag means something is blocking the loop (e.g. CPU work outside the threadpool),
+    which delays every in-flight request on the worker.
+    """
+
+    def __init__(self, interval: float = 0.1, history: int = 600):
+        self.interval = interval
+        # (unix timestamp, lag in ms) for the most recent samples
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=history)
+        self._max_lag_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.perf_counter() - start - self.interval) * 1000)
+            self._samples.append((time.time(), lag_ms))
+            self._max_lag_ms = max(self._max_lag_ms, lag_ms)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Latest, recent-window and all-time maximum lag in milliseconds."""
+        recent = [lag for _, lag in self._samples]
+        return {
+            "lag_ms_last": round(recent[-1], 2) if recent else 0.0,
+            "lag_ms_mean": round(sum(recent) / len(recent), 2) if recent else 0.0,
+            "lag_ms_max_recent": round(max(recent), 2) if recent else 0.0,
+            "lag_ms_max": round(self._max_lag_ms, 2),
+            "samples": len(recent),
+        }
+
+
+loop_lag_monitor = EventLoopLagMonitor()
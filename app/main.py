@@ -10,6 +10,8 @@ from starlette.middleware.cors import CORSMiddleware
 load_dotenv()
 
 from app.api import analyze as analyze_module
+from app.api import metrics as metrics_module
+from app.core.loop_lag import loop_lag_monitor
 
 app = FastAPI(
     title="CV Analysis Advisor",
@@ -23,7 +25,19 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+
+@app.on_event("startup")
+async def start_loop_lag_monitor():
+    loop_lag_monitor.start()
+
+
+@app.on_event("shutdown")
+async def stop_loop_lag_monitor():
+    loop_lag_monitor.stop()
+
+
 app.include_router(analyze_module.router, prefix="/api")
+app.include_router(metrics_module.router, prefix="/api")
 
 # serve static frontend (index.html)
 app.mount("/", StaticFiles(directory="static", html=True), name="static")
@@ -71,9 +71,20 @@ class DesignReview(BaseModel):
     criteria: Dict[str, DesignCriterion]
     summary: DesignReviewSummary
 
+class StageStatus(BaseModel):
+    """Outcome and timing of one pipeline stage."""
+    status: str  # "ok", "error", "timeout" or "skipped"
+    elapsed_ms: float = 0.0
+    detail: str = ""
+
+
 class AnalyzeResponse(BaseModel):
+    # Sections are optional so a response that hit its deadline, or that was
+    # restricted with `include=`, still validates
     design_review: Optional[DesignReview] = None
-    review: Review
-    interviewQuestions: List[InterviewTopic]
-    parsed_resume: ParsedResume
+    review: Optional[Review] = None
+    interviewQuestions: Optional[List[InterviewTopic]] = None
+    parsed_resume: Optional[ParsedResume] = None
+    stages: Dict[str, StageStatus] = {}
+    partial: bool = False
 
@@ -0,0 +1,84 @@
+"""
+Compare the rule-based "lite" parser with the Gemini parser on the CVs in tests/data.
+
+Usage:
+    python -m benchmarks.bench_lite_parser [--runs 20]
+
+The Gemini result is treated as the reference: for each rule-extracted field the
+benchmark reports whether the lite parser agrees with it, plus the latency of both.
+Requires 'unstructured' for extraction and GEMINI_API_KEY for the reference parse.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.ai.chain import ResumeParser
+from app.core.extractor import extract_structured_json_from_file
+from app.core.lite_parser import RULE_FIELDS, parse_elements
+
+
+def _normalize(value):
+    """Comparable form of a field value: casefolded strings, sets for lists."""
+    if isinstance(value, list):
+        return {_normalize(item.get("name", "") if isinstance(item, dict) else item) for item in value} - {""}
+    if not isinstance(value, str):
+        return value
+    return " ".join(value.casefold().split())
+
+
+def _field_agrees(field: str, lite_value, llm_value) -> bool:
+    if field == "phone":
+        return re.sub(r"\D", "", lite_value)[-9:] == re.sub(r"\D", "", llm_value)[-9:]
+    lite, llm = _normalize(lite_value), _normalize(llm_value)
+    if isinstance(llm, set):
+        # Lists agree when the lite parser recovers at least half of the reference items
+        return not llm and not lite or bool(llm) and len(lite & llm) / len(llm) >= 0.5
+    return lite == llm
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=os.path.join("tests", "data"))
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    agreement = {field: 0 for field in RULE_FIELDS}
+    samples = sorted(glob.glob(os.path.join(args.data_dir, "*.pdf")))
+    for path in samples:
+        with open(path, "rb") as f:
+            structured_json_str = extract_structured_json_from_file(os.path.basename(path), f.read())
+        if not structured_json_str:
+            sys.exit(f"Extraction failed for {path}")
+        elements = json.loads(structured_json_str)
+
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            lite = parse_elements(elements)["parsed_resume"]
+        lite_ms = (time.perf_counter() - start) / args.runs * 1000
+
+        start = time.perf_counter()
+        llm_result = ResumeParser().analyze(structured_json_str)
+        llm_ms = (time.perf_counter() - start) * 1000
+        if "parsed_resume" not in llm_result:
+            sys.exit(f"Gemini parsing failed for {path}: {llm_result.get('error')}")
+        llm = llm_result["parsed_resume"]
+
+        print(f"\n{os.path.basename(path)}: lite {lite_ms:.2f} ms, LLM {llm_ms:.0f} ms (x{llm_ms / lite_ms:.0f})")
+        for field in RULE_FIELDS:
+            agrees = _field_agrees(field, lite[field], llm[field])
+            agreement[field] += agrees
+            print(f"  {'OK ' if agrees else 'DIFF'} {field:<15} lite={lite[field]!r:.60} llm={llm[field]!r:.60}")
+
+    print("\nField agreement with the LLM parser:")
+    for field, count in agreement.items():
+        print(f"  {field:<15} {count}/{len(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark serial vs page-parallel partitioning on the PDFs in tests/data.
+
+Usage:
+    python -m benchmarks.bench_partition [--workers 1,2,4,8] [--tile 8]
+
+`--tile N` concatenates each sample N times to simulate a longer document
+(e.g. an academic CV or portfolio). The samples in tests/data are single-page
+CVs, so the default of 8 is needed to reach the parallel path at all.
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core import extractor
+
+
+def _tiled_copy(path: str, times: int, out_dir: str) -> str:
+    """Write a copy of `path` with its pages repeated `times` times."""
+    if times <= 1:
+        return path
+    reader = extractor.PdfReader(path)
+    writer = extractor.PdfWriter()
+    for _ in range(times):
+        for page in reader.pages:
+            writer.add_page(page)
+    out_path = os.path.join(out_dir, f"tiled-{times}x-{os.path.basename(path)}")
+    with open(out_path, "wb") as f:
+        writer.write(f)
+    return out_path
+
+
+def _time_partition(path: str, workers: int, runs: int) -> float:
+    """Return the best wall-clock time over `runs` partitions of `path` with `workers` processes."""
+    extractor._reset_process_pool()
+    extractor.PARALLEL_MAX_WORKERS = workers
+    # Warm up the pool (process spawn and model loading) outside the timed runs
+    extractor._partition_file(path)
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        extractor._partition_file(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=os.path.join("tests", "data"))
+    parser.add_argument("--workers", default=f"1,2,4,{os.cpu_count() or 1}")
+    parser.add_argument("--tile", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    if not (extractor._HAS_UNSTRUCTURED and extractor._HAS_PYPDF):
+        sys.exit("This benchmark needs 'unstructured[pdf]' (which provides pypdf) to be installed.")
+
+    # Always take the parallel path so the worker count is the only variable
+    extractor.PARALLEL_MIN_PAGES = 2
+    worker_counts = sorted({int(w) for w in args.workers.split(",")})
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        for sample in sorted(glob.glob(os.path.join(args.data_dir, "*.pdf"))):
+            path = _tiled_copy(sample, args.tile, out_dir)
+            pages = extractor._count_pdf_pages(path)
+            print(f"\n{os.path.basename(sample)} ({pages} pages)")
+            if pages < 2:
+                # A single page always takes the serial path, so any "speedup" would be meaningless
+                print("  skipped: fewer than 2 pages, increase --tile")
+                continue
+            baseline = None
+            for workers in worker_counts:
+                elapsed = _time_partition(path, workers, args.runs)
+                baseline = baseline or elapsed
+                print(f"  workers={workers:<3} {elapsed:8.2f}s  speedup x{baseline / elapsed:.2f}")
+
+    extractor._reset_process_pool()
+
+
+if __name__ == "__main__":
+    main()
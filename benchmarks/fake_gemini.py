@@ -0,0 +1,205 @@
+"""
+A local stand-in for the Gemini REST API, for load tests that should not hit (or pay for) the real service.
+
+Usage:
+    python -m benchmarks.fake_gemini --port 8765 --latency lognormal:0.0,0.5 --error-rate 0.02
+
+Then start the API against it:
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8765 GEMINI_API_KEY=fake uvicorn app.main:app
+
+Every `models/<model>:generateContent` call sleeps for a delay drawn from the latency
+distribution, fails with `--error-status` at `--error-rate`, and otherwise returns a
+canned structured reply for the task the prompt belongs to (parse, review, interview or
+design review). Latency specs: fixed:S, uniform:LO,HI, normal:MEAN,STD, lognormal:MU,SIGMA
+(seconds; lognormal parameters are those of the underlying normal).
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict
+
+CANNED_REPLIES: Dict[str, Dict[str, Any]] = {
+    "parse_resume": {
+        "parsed_resume": {
+            "name": "Jane Doe",
+            "email": "jane.doe@example.com",
+            "phone": "+84 912 345 678",
+            "summary": "Backend engineer with 5 years of experience building APIs.",
+            "skills": ["Python", "FastAPI", "PostgreSQL", "Docker"],
+            "work_experience": [
+                {"company": "Acme", "position": "Backend Engineer", "duration": "2020-2024",
+                 "role_description": "Built and operated REST APIs."}
+            ],
+            "projects": [{"name": "CV Analyzer", "description": "Resume parsing service.", "time_of_project": "2024"}],
+            "education": [{"degree": "BSc Computer Science", "institution": "State University", "year": "2019"}],
+            "certifications": [{"name": "AWS Certified Developer"}],
+            "awards": [],
+            "languages": ["English"],
+            "location": "Hanoi, Vietnam",
+        }
+    },
+    "review": {
+        "review": {
+            "score": 7.5,
+            "strengths": ["Clear structure."],
+            "weaknesses": ["Few quantified achievements."],
+            "suggestions": ["Add metrics to each role."],
+        }
+    },
+    "interview": {
+        "interviewQuestions": [
+            {
+                "topic": "Technical & Probing Questions",
+                "topic_en": "technical_probing_questions",
+                "questions": [{"question": "How would you scale the CV Analyzer API?", "difficulty": "medium"}],
+            }
+        ]
+    },
+    "design_review": {
+        "design_review": {
+            "criteria": {
+                "color_and_contrast": {"score": 4, "justification": "Readable palette."},
+                "typography_and_hierarchy": {"score": 4, "justification": "Clear headings."},
+                "layout_and_whitespace": {"score": 3, "justification": "Slightly dense."},
+            },
+            "summary": {"overall_score": 3.7, "strengths": ["Consistent fonts."], "suggestions": ["Add whitespace."]},
+        }
+    },
+}
+
+# Distinctive phrases from app.ai.prompts that identify the task of a request
+_TASK_MARKERS = (
+    ("design_review", "UI/UX Designer"),
+    ("parse_resume", "resume parsing AI"),
+    ("interview", "expert interviewer"),
+    ("review", "expert hiring manager"),
+)
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """Turns a latency spec such as 'uniform:0.2,1.0' into a sampler returning seconds."""
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",")] if params else []
+    samplers = {
+        "fixed": lambda: values[0],
+        "uniform": lambda: random.uniform(values[0], values[1]),
+        "normal": lambda: random.gauss(values[0], values[1]),
+        "lognormal": lambda: random.lognormvariate(values[0], values[1]),
+    }
+    if kind not in samplers:
+        raise argparse.ArgumentTypeError(f"Unknown latency distribution: {kind}")
+    return lambda: max(0.0, samplers[kind]())
+
+
+def _detect_task(body: Dict[str, Any]) -> str:
+    """
+    Identifies the task from the prompt's leading CONTEXT line only. The rest of the text
+    contains the CV itself, which may well mention e.g. "UI/UX Designer".
+    """
+    text = next(
+        (part["text"] for content in body.get("contents", []) for part in content.get("parts", []) if part.get("text")),
+        "",
+    )
+    context = text.lstrip().split("\n", 1)[0][:300]
+    for task, marker in _TASK_MARKERS:
+        if marker in context:
+            return task
+    return "review"
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    # Set by serve()
+    latency: Callable[[], float] = staticmethod(lambda: 0.0)
+    error_rate = 0.0
+    error_status = 500
+    counters: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        # Counters for the load-test report
+        with self.lock:
+            self._send_json(200, dict(self.counters))
+
+    def do_POST(self) -> None:
+        match = re.search(r"/models/([^/:]+):generateContent", self.path)
+        if not match:
+            self._send_json(404, {"error": {"code": 404, "message": f"Unknown path {self.path}", "status": "NOT_FOUND"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        task = _detect_task(body)
+        time.sleep(self.latency())
+
+        if random.random() < self.error_rate:
+            self._count(f"{task}.error")
+            status = "RESOURCE_EXHAUSTED" if self.error_status == 429 else "INTERNAL"
+            self._send_json(self.error_status, {"error": {"code": self.error_status, "message": "Injected failure", "status": status}})
+            return
+
+        self._count(f"{task}.ok")
+        reply = json.dumps(CANNED_REPLIES[task], ensure_ascii=False)
+        self._send_json(200, {
+            "candidates": [{
+                "content": {"parts": [{"text": reply}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0,
+            }],
+            "usageMetadata": {"promptTokenCount": length // 4, "candidatesTokenCount": len(reply) // 4,
+                              "totalTokenCount": length // 4 + len(reply) // 4},
+            "modelVersion": match.group(1),
+        })
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Per-request logging would dominate the output under load
+        pass
+
+
+def serve(host: str, port: int, latency: Callable[[], float], error_rate: float, error_status: int) -> ThreadingHTTPServer:
+    """Starts the stand-in server in a background thread and returns it."""
+    FakeGeminiHandler.latency = staticmethod(latency)
+    FakeGeminiHandler.error_rate = error_rate
+    FakeGeminiHandler.error_status = error_status
+    FakeGeminiHandler.counters = {}
+    server = ThreadingHTTPServer((host, port), FakeGeminiHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=parse_latency, default=parse_latency("lognormal:0.0,0.5"))
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500, choices=(429, 500, 503))
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.latency, args.error_rate, args.error_status)
+    print(f"Fake Gemini listening on http://{args.host}:{args.port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+End-to-end load test for /api/analyze (and the static frontend).
+
+Usage:
+    # 1. Start the Gemini stand-in and the API pointed at it
+    python -m benchmarks.fake_gemini --latency lognormal:0.0,0.5 --error-rate 0.01
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8765 GEMINI_API_KEY=fake uvicorn app.main:app
+
+    # 2. Drive it: open loop at 2 uploads/s, at most 16 in flight, for two minutes
+    python -m benchmarks.loadtest --rate 2 --concurrency 16 --duration 120
+
+With `--rate 0` the test runs closed loop (each of `--concurrency` clients sends its next
+request as soon as the previous one returns). In open loop, latency is measured from the
+scheduled arrival time, so client-side queueing is not hidden (no coordinated omission).
+
+Every `--interval` seconds the report shows throughput, p50/p95/p99 latency, error rates,
+and the server's event-loop lag and admission queue depth from /api/metrics.
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple
+
+import requests
+
+
+class Sample(NamedTuple):
+    finished_at: float
+    latency: float
+    status: int  # 0 for connection errors and client timeouts
+    kind: str  # "analyze" or "static"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values` (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.samples: List[Sample] = []
+        self.metrics: List[Dict[str, Any]] = []
+        self.files = self._load_files(args.data_dir)
+        self.params = {k: v for k, v in (("include", args.include), ("mode", args.mode), ("budget_ms", args.budget_ms)) if v}
+        self._local = threading.local()
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _load_files(data_dir: str) -> List[tuple]:
+        files = []
+        for path in sorted(glob.glob(os.path.join(data_dir, "*.pdf"))):
+            with open(path, "rb") as f:
+                files.append((os.path.basename(path), f.read()))
+        if not files:
+            raise SystemExit(f"No PDF files found in {data_dir}")
+        return files
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _send(self, scheduled_at: float) -> None:
+        """Sends one request; latency counts from `scheduled_at` so client queueing is included."""
+        kind = "static" if random.random() < self.args.static_ratio else "analyze"
+        try:
+            if kind == "static":
+                response = self._session().get(f"{self.args.base_url}/", timeout=self.args.timeout)
+            else:
+                name, content = random.choice(self.files)
+                response = self._session().post(
+                    f"{self.args.base_url}/api/analyze",
+                    files={"file": (name, content, "application/pdf")},
+                    params=self.params,
+                    timeout=self.args.timeout,
+                )
+            status = response.status_code
+        except requests.RequestException:
+            status = 0
+        now = time.perf_counter()
+        self.samples.append(Sample(now, now - scheduled_at, status, kind))
+
+    def _poll_metrics(self, started_at: float) -> None:
+        while not self._stop.wait(self.args.interval):
+            try:
+                data = requests.get(f"{self.args.base_url}/api/metrics", timeout=5).json()
+            except (requests.RequestException, ValueError):
+                continue
+            data["elapsed"] = time.perf_counter() - started_at
+            self.metrics.append(data)
+
+    def _run_open_loop(self, pool: ThreadPoolExecutor, end_at: float) -> None:
+        next_at = time.perf_counter()
+        while next_at < end_at:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(self._send, next_at)
+            # Poisson arrivals
+            next_at += random.expovariate(self.args.rate)
+
+    def _run_closed_loop(self, pool: ThreadPoolExecutor, end_at: float) -> None:
+        def client() -> None:
+            while time.perf_counter() < end_at:
+                self._send(time.perf_counter())
+
+        for _ in range(self.args.concurrency):
+            pool.submit(client)
+
+    def run(self) -> Dict[str, Any]:
+        started_at = time.perf_counter()
+        end_at = started_at + self.args.duration
+        poller = threading.Thread(target=self._poll_metrics, args=(started_at,), daemon=True)
+        poller.start()
+        reporter = threading.Thread(target=self._report_loop, args=(started_at,), daemon=True)
+        reporter.start()
+
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as pool:
+            if self.args.rate > 0:
+                self._run_open_loop(pool, end_at)
+            else:
+                self._run_closed_loop(pool, end_at)
+        self._stop.set()
+        poller.join()
+        reporter.join()
+        return self.summary(started_at)
+
+    def _window_stats(self, samples: List[Sample], seconds: float) -> Dict[str, Any]:
+        analyze = [s for s in samples if s.kind == "analyze"]
+        ok = [s.latency * 1000 for s in analyze if s.status == 200]
+        statuses: Dict[str, int] = {}
+        for s in samples:
+            statuses[str(s.status)] = statuses.get(str(s.status), 0) + 1
+        errors = sum(1 for s in samples if s.status != 200)
+        static = [s.latency * 1000 for s in samples if s.kind == "static" and s.status == 200]
+        return {
+            "requests": len(samples),
+            "throughput_rps": round(len(samples) / seconds, 2) if seconds else 0.0,
+            "analyze_p50_ms": round(percentile(ok, 50), 1),
+            "analyze_p95_ms": round(percentile(ok, 95), 1),
+            "analyze_p99_ms": round(percentile(ok, 99), 1),
+            "static_p99_ms": round(percentile(static, 99), 1),
+            "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+            "rejected_503": statuses.get("503", 0),
+            "statuses": statuses,
+        }
+
+    def _report_loop(self, started_at: float) -> None:
+        print(f"{'t(s)':>6} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'err%':>6} {'503':>5} "
+              f"{'lag_ms':>8} {'lag_max':>8} {'queue':>6}")
+        window_start = started_at
+        seen = 0
+        while not self._stop.wait(self.args.interval):
+            now = time.perf_counter()
+            window = self.samples[seen:]
+            seen += len(window)
+            stats = self._window_stats(window, now - window_start)
+            loop = self.metrics[-1] if self.metrics else {}
+            lag = loop.get("event_loop", {})
+            print(f"{now - started_at:6.0f} {stats['throughput_rps']:7.2f} {stats['analyze_p50_ms']:8.0f} "
+                  f"{stats['analyze_p95_ms']:8.0f} {stats['analyze_p99_ms']:8.0f} {stats['error_rate'] * 100:6.1f} "
+                  f"{stats['rejected_503']:5d} {lag.get('lag_ms_mean', 0):8.1f} {lag.get('lag_ms_max_recent', 0):8.1f} "
+                  f"{loop.get('admission', {}).get('queue_depth', 0):6d}")
+            window_start = now
+
+    def summary(self, started_at: float) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - started_at
+        lags = [m["event_loop"]["lag_ms_max_recent"] for m in self.metrics if "event_loop" in m]
+        return {
+            "config": {k: v for k, v in vars(self.args).items() if k != "json_out"},
+            "overall": self._window_stats(self.samples, elapsed),
+            "event_loop_lag_ms_max": max(lags) if lags else None,
+            "server_metrics": self.metrics,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--data-dir", default=os.path.join("tests", "data"))
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum requests in flight.")
+    parser.add_argument("--rate", type=float, default=0.0, help="Arrivals per second (0 = closed loop).")
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--interval", type=float, default=5.0, help="Reporting window in seconds.")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Client-side timeout per request.")
+    parser.add_argument("--static-ratio", type=float, default=0.0, help="Fraction of requests sent to the frontend.")
+    parser.add_argument("--include", default=None, help="Forwarded to /api/analyze.")
+    parser.add_argument("--mode", default=None, help="Forwarded to /api/analyze.")
+    parser.add_argument("--budget-ms", type=int, default=None, help="Forwarded to /api/analyze.")
+    parser.add_argument("--json-out", default=None, help="Write the summary and metric samples to this file.")
+    args = parser.parse_args()
+
+    result = LoadTest(args).run()
+    overall = result["overall"]
+    print("\n--- Summary ---")
+    print(json.dumps({**overall, "event_loop_lag_ms_max": result["event_loop_lag_ms_max"]}, indent=2))
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
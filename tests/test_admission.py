@@ -0,0 +1,156 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path to allow imports from 'app'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.concurrency import AdmissionController, OverloadedError
+
+
+async def _hold_slot(controller: AdmissionController, release: asyncio.Event, max_wait=None) -> None:
+    async with controller.admit(max_wait=max_wait):
+        await release.wait()
+
+
+def test_admits_simultaneous_requests_while_slots_are_free():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=4, max_queue=1, max_wait=30)
+        release = asyncio.Event()
+        tasks = [asyncio.ensure_future(_hold_slot(controller, release)) for _ in range(4)]
+        await asyncio.sleep(0)
+        assert controller.in_flight == 4
+        assert controller.queue_depth == 0
+        release.set()
+        await asyncio.gather(*tasks)
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.admitted == 4 and controller.completed == 4
+    assert controller.rejected_queue_full == 0 and controller.rejected_wait == 0
+
+
+def test_one_runs_one_queues_and_the_rest_are_rejected_when_queue_is_full():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=1, max_wait=30)
+        release = asyncio.Event()
+        tasks = [asyncio.ensure_future(_hold_slot(controller, release)) for _ in range(4)]
+        await asyncio.sleep(0)
+        assert controller.in_flight == 1 and controller.queue_depth == 1
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return controller, results
+
+    controller, results = asyncio.run(scenario())
+    rejections = [r for r in results if isinstance(r, OverloadedError)]
+    assert len(rejections) == 2
+    assert all(r.reason == "Admission queue is full." and r.retry_after >= 1 for r in rejections)
+    assert controller.admitted == 2 and controller.rejected_queue_full == 2
+
+
+def test_rejects_when_estimated_wait_exceeds_deadline():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=10, max_wait=30)
+        # Seed the service-time average with one 5-second request
+        controller._record_service_time(5.0)
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(_hold_slot(controller, release))
+        await asyncio.sleep(0)
+        with pytest.raises(OverloadedError) as excinfo:
+            async with controller.admit(max_wait=1.0):
+                pass
+        release.set()
+        await holder
+        return controller, excinfo.value
+
+    controller, error = asyncio.run(scenario())
+    assert error.reason == "Estimated queueing time exceeds the deadline."
+    assert error.retry_after == 5
+    assert controller.rejected_wait == 1 and controller.queue_depth == 0
+
+
+def test_rejects_after_waiting_longer_than_max_wait():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=10, max_wait=30)
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(_hold_slot(controller, release))
+        await asyncio.sleep(0)
+        with pytest.raises(OverloadedError) as excinfo:
+            async with controller.admit(max_wait=0.05):
+                pass
+        release.set()
+        await holder
+        return controller, excinfo.value
+
+    controller, error = asyncio.run(scenario())
+    assert error.reason == "Timed out waiting in the admission queue."
+    assert controller.rejected_wait == 1 and controller.queue_depth == 0
+
+
+def test_overloaded_analyze_returns_503_with_retry_after(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.api import analyze as analyze_module
+    from app.main import app
+
+    def overloaded(max_wait=None):
+        raise OverloadedError("Admission queue is full.", 7)
+
+    monkeypatch.setattr(analyze_module.admission, "admit", overloaded)
+    cv_path = os.path.join("tests", "data", "cv-example-1-1.pdf")
+    with open(cv_path, "rb") as f:
+        files = {"file": (os.path.basename(cv_path), f, "application/pdf")}
+        response = TestClient(app).post("/api/analyze", files=files)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+
+
+def test_run_stage_passes_the_budget_left_after_waiting_for_a_slot(monkeypatch):
+    import time
+    from app.core import concurrency
+
+    timeouts = []
+
+    def llm_call(timeout=None):
+        timeouts.append(timeout)
+        time.sleep(0.3)
+        return timeout
+
+    async def scenario():
+        monkeypatch.setitem(concurrency._stage_semaphores, "llm", asyncio.Semaphore(1))
+        deadline = concurrency.Deadline(1.0)
+        return await asyncio.gather(
+            concurrency.run_stage("llm", llm_call, deadline=deadline, pass_timeout=True),
+            concurrency.run_stage("llm", llm_call, deadline=deadline, pass_timeout=True),
+        )
+
+    asyncio.run(scenario())
+    # The second call waited ~0.3s for the only slot, so it gets a correspondingly smaller timeout
+    assert timeouts[0] > 0.9
+    assert timeouts[1] < 0.75
+
+
+def test_run_stage_skips_the_call_when_the_deadline_passed_while_waiting(monkeypatch):
+    import time
+    from app.core import concurrency
+
+    calls = []
+
+    def llm_call(timeout=None):
+        calls.append(timeout)
+        time.sleep(0.3)
+
+    async def scenario():
+        monkeypatch.setitem(concurrency._stage_semaphores, "llm", asyncio.Semaphore(1))
+        first = asyncio.ensure_future(concurrency.run_stage("llm", llm_call))
+        await asyncio.sleep(0.05)
+        with pytest.raises(asyncio.TimeoutError):
+            await concurrency.run_stage("llm", llm_call, deadline=concurrency.Deadline(0.1), pass_timeout=True)
+        await first
+        # Give an abandoned stage time to (wrongly) run after the slot frees up
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+    assert calls == [None]
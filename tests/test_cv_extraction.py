@@ -66,3 +66,80 @@ def test_analyze_cv_full_flow():
     
     print("\nTest passed: The /api/analyze endpoint returned a valid, comprehensive response including the design review.")
 
+
+def test_analyze_cv_returns_partial_result_on_deadline(monkeypatch):
+    """
+    Tests that a stage which misses the request's latency budget is reported as timed out,
+    while the stages that completed are still returned.
+    """
+    import time
+    from app.api import analyze as analyze_module
+
+    parsed = {"parsed_resume": {"name": "Jane Doe", "email": "jane@example.com"}}
+    review = {"review": {"score": 8.0, "strengths": [], "weaknesses": [], "suggestions": []}}
+    design_review = {"design_review": {
+        "criteria": {"layout_and_whitespace": {"score": 4, "justification": "Clean."}},
+        "summary": {"overall_score": 4.0, "strengths": [], "suggestions": []},
+    }}
+
+    def slow_interview(self, text, timeout=None):
+        time.sleep(1.0)
+        return {"interviewQuestions": []}
+
+    # Every stage except the interview succeeds, so `partial` depends only on its timeout
+    monkeypatch.setattr(analyze_module, "render_pdf_page_to_base64_image", lambda content: "aW1hZ2U=")
+    monkeypatch.setattr(analyze_module.CVDesignReviewer, "analyze", lambda self, image, timeout=None: design_review)
+    monkeypatch.setattr(analyze_module, "extract_structured_json_from_file", lambda filename, content: "[]")
+    monkeypatch.setattr(analyze_module, "parse_structured_resume", lambda text, mode="full", timeout=None: parsed)
+    monkeypatch.setattr(analyze_module.CVReviewer, "analyze", lambda self, text, timeout=None: review)
+    monkeypatch.setattr(analyze_module.InterviewQuestionGenerator, "analyze", slow_interview)
+
+    cv_path = os.path.join("tests", "data", "cv-example-1-1.pdf")
+    with open(cv_path, "rb") as f:
+        files = {"file": (os.path.basename(cv_path), f, "application/pdf")}
+        response = client.post("/api/analyze", files=files, params={"budget_ms": 300})
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["partial"] is True
+    assert data["parsed_resume"]["email"] == "jane@example.com"
+    assert data["review"]["score"] == 8.0
+    assert data["interviewQuestions"] is None
+    assert data["stages"]["interview"]["status"] == "timeout"
+    assert data["stages"]["review"]["status"] == "ok"
+    assert data["stages"]["render"]["status"] == "ok"
+    assert data["stages"]["design_review"]["status"] == "ok"
+    assert data["design_review"]["summary"]["overall_score"] == 4.0
+    assert [name for name, stage in data["stages"].items() if stage["status"] != "ok"] == ["interview"]
+
+
+def test_analyze_cv_include_computes_only_requested_sections(monkeypatch):
+    """
+    Tests that `include=parsed_resume` runs only extraction and parsing: the PDF is not
+    rendered and no review, interview or design review call is made.
+    """
+    from app.api import analyze as analyze_module
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Stage should not run when its section is not requested.")
+
+    parsed = {"parsed_resume": {"name": "Jane Doe", "email": "jane@example.com"}}
+    monkeypatch.setattr(analyze_module, "render_pdf_page_to_base64_image", fail)
+    monkeypatch.setattr(analyze_module, "extract_structured_json_from_file", lambda filename, content: "[]")
+    monkeypatch.setattr(analyze_module, "parse_structured_resume", lambda text, mode="full", timeout=None: parsed)
+    monkeypatch.setattr(analyze_module.CVReviewer, "analyze", fail)
+    monkeypatch.setattr(analyze_module.InterviewQuestionGenerator, "analyze", fail)
+    monkeypatch.setattr(analyze_module.CVDesignReviewer, "analyze", fail)
+
+    cv_path = os.path.join("tests", "data", "cv-example-1-1.pdf")
+    with open(cv_path, "rb") as f:
+        files = {"file": (os.path.basename(cv_path), f, "application/pdf")}
+        response = client.post("/api/analyze", files=files, params={"include": "parsed_resume"})
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["partial"] is False
+    assert data["parsed_resume"]["email"] == "jane@example.com"
+    assert data["review"] is None and data["interviewQuestions"] is None and data["design_review"] is None
+    assert data["stages"]["render"]["status"] == "skipped"
+    assert data["stages"]["review"]["status"] == "skipped"
@@ -0,0 +1,62 @@
+import os
+import sys
+
+# Add the project root to the Python path to allow imports from 'app'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.lite_parser import AhoCorasickMatcher, SKILLS, llm_fields, parse_elements
+
+
+def test_skill_matcher_prefers_longest_whole_word_match():
+    matcher = AhoCorasickMatcher(SKILLS)
+    found = matcher.find_all("Java, JavaScript, Spring Boot, C++ and C#, node.js")
+    assert found == ["Java", "JavaScript", "Spring Boot", "C++", "C#", "Node.js"]
+
+
+def test_parse_elements_extracts_rule_fields():
+    elements = [
+        {"type": "Title", "text": "Nguyễn Văn An"},
+        {"type": "Text", "text": "Email: an.nguyen@example.com | +84 912 345 678 | Địa chỉ: Hà Nội, Việt Nam"},
+        {"type": "Title", "text": "KỸ NĂNG"},
+        {"type": "ListItem", "text": "Java, Spring Boot, MySQL, Docker"},
+        {"type": "Title", "text": "Certifications"},
+        {"type": "ListItem", "text": "• AWS Certified Developer"},
+        {"type": "Title", "text": "Ngoại ngữ"},
+        {"type": "Text", "text": "Tiếng Anh (IELTS 7.0)"},
+    ]
+    resume = parse_elements(elements)["parsed_resume"]
+
+    assert resume["name"] == "Nguyễn Văn An"
+    assert resume["email"] == "an.nguyen@example.com"
+    assert resume["phone"] == "+84 912 345 678"
+    assert resume["location"] == "Hà Nội, Việt Nam"
+    assert resume["skills"] == ["Java", "Spring Boot", "MySQL", "Docker"]
+    assert resume["certifications"] == [{"name": "AWS Certified Developer"}]
+    assert resume["languages"] == ["Tiếng Anh"]
+    # Email and phone were found, so full mode asks the LLM for everything else only
+    assert "email" not in llm_fields(resume) and "phone" not in llm_fields(resume)
+    assert {"name", "skills", "work_experience", "projects", "education"} <= set(llm_fields(resume))
+
+
+def test_parse_elements_does_not_guess_skills_or_summary_from_prose():
+    elements = [
+        {"type": "Title", "text": "Profile"},
+        {"type": "Text", "text": "0979527156 · jane@example.com · Hanoi"},
+        {"type": "NarrativeText", "text": "I want to go further and express myself, and I excel in teamwork."},
+    ]
+    resume = parse_elements(elements)["parsed_resume"]
+
+    assert resume["skills"] == []
+    assert resume["summary"] == "I want to go further and express myself, and I excel in teamwork."
+    # Only email and phone are trusted over the LLM in full mode
+    assert "email" not in llm_fields(resume) and "phone" not in llm_fields(resume)
+    assert {"name", "summary", "skills"} <= set(llm_fields(resume))
+
+
+def test_parse_elements_skips_document_titles_and_job_titles_for_the_name():
+    contact = {"type": "Text", "text": "nguyen.van.a@example.com | 0912 345 678"}
+    cv_title_first = [{"type": "Title", "text": "CURRICULUM VITAE"}, {"type": "Text", "text": "Nguyen Van A"}, contact]
+    job_title_first = [{"type": "Title", "text": "Software Engineer Intern"}, {"type": "Text", "text": "Nguyen Van A"}, contact]
+
+    assert parse_elements(cv_title_first)["parsed_resume"]["name"] == "Nguyen Van A"
+    assert parse_elements(job_title_first)["parsed_resume"]["name"] == "Nguyen Van A"
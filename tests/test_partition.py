@@ -0,0 +1,91 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add the project root to the Python path to allow imports from 'app'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pypdf = pytest.importorskip("pypdf")
+
+from app.core import extractor
+
+
+def _page_markers(path, starting_page_number=1, **kwargs):
+    """Stands in for partition(): one element per page, naming the page number."""
+    pages = len(pypdf.PdfReader(path).pages)
+    return [{"type": "Page", "text": str(starting_page_number + i)} for i in range(pages)]
+
+
+@pytest.fixture
+def long_pdf(tmp_path):
+    """A 9-page PDF made by tiling the single-page sample CV."""
+    reader = pypdf.PdfReader(os.path.join("tests", "data", "cv-example-1-1.pdf"))
+    writer = pypdf.PdfWriter()
+    for _ in range(9):
+        writer.add_page(reader.pages[0])
+    path = str(tmp_path / "long.pdf")
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def test_parallel_partition_merges_chunks_in_page_order(monkeypatch, long_pdf):
+    monkeypatch.setattr(extractor, "_partition_to_dicts", _page_markers)
+    monkeypatch.setattr(extractor, "PARALLEL_MAX_WORKERS", 4)
+    monkeypatch.setattr(extractor, "PAGES_PER_CHUNK", 2)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        elements = extractor._partition_pdf_parallel(long_pdf, 9, pool)
+
+    assert [el["text"] for el in elements] == [str(page) for page in range(1, 10)]
+
+
+def test_documents_below_threshold_are_partitioned_serially(monkeypatch, long_pdf):
+    def no_pool():
+        raise AssertionError("The process pool should not be used below the page threshold.")
+
+    calls = []
+    monkeypatch.setattr(extractor, "_get_process_pool", no_pool)
+    monkeypatch.setattr(extractor, "_partition_to_dicts", lambda path, **kwargs: calls.append(kwargs) or [])
+    monkeypatch.setattr(extractor, "PARALLEL_MAX_WORKERS", 4)
+    monkeypatch.setattr(extractor, "PARALLEL_MIN_PAGES", 10)
+
+    extractor._partition_file(long_pdf)
+    assert calls == [{}]
+
+
+def test_failed_split_falls_back_to_serial(monkeypatch, long_pdf):
+    def broken_split(*args, **kwargs):
+        raise ValueError("cannot split")
+
+    calls = []
+    monkeypatch.setattr(extractor, "_get_process_pool", lambda: ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(extractor, "_split_pdf", broken_split)
+    monkeypatch.setattr(extractor, "_partition_to_dicts", lambda path, **kwargs: calls.append(kwargs) or [])
+    monkeypatch.setattr(extractor, "PARALLEL_MAX_WORKERS", 4)
+    monkeypatch.setattr(extractor, "PARALLEL_MIN_PAGES", 2)
+
+    assert extractor._partition_file(long_pdf) == []
+    assert calls == [{}]
+
+
+def test_failed_chunk_falls_back_to_serial(monkeypatch, long_pdf):
+    calls = []
+
+    def partition_to_dicts(path, **kwargs):
+        calls.append(kwargs)
+        if kwargs.get("starting_page_number") == 3:
+            raise ValueError("bad chunk")
+        return [{"type": "Page", "text": "whole document"}] if not kwargs else []
+
+    monkeypatch.setattr(extractor, "_get_process_pool", lambda: ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(extractor, "_partition_to_dicts", partition_to_dicts)
+    monkeypatch.setattr(extractor, "PARALLEL_MAX_WORKERS", 4)
+    monkeypatch.setattr(extractor, "PAGES_PER_CHUNK", 2)
+    monkeypatch.setattr(extractor, "PARALLEL_MIN_PAGES", 2)
+
+    assert extractor._partition_file(long_pdf) == [{"type": "Page", "text": "whole document"}]
+    # The serial retry is the last call, over the whole file
+    assert calls[-1] == {}